@@ -4,8 +4,56 @@ from models.circuit_model import CircuitModel
 from models.code_generator import QiskitCodeGenerator
 from models.code_parser import QiskitCodeParser
 from views.custom_gate_dialog import CustomGateDialog
+from views.custom_gate_analyzer import CustomGateAnalyzer
+from functools import lru_cache
 import numpy as np
 
+
+@lru_cache(maxsize=8)
+def _bloch_index_pairs(num_qubits):
+    """Basis indices with each qubit's bit cleared/set, as two (num_qubits, 2**(n-1)) arrays."""
+    basis = np.arange(1 << num_qubits)
+    bits = 1 << np.arange(num_qubits)
+    # Qiskit is little-endian: qubit i is bit i of the basis index
+    mask = (basis[None, :] & bits[:, None]) == 0
+    idx0 = basis[None, :].repeat(num_qubits, axis=0)[mask].reshape(num_qubits, -1)
+    idx1 = idx0 | bits[:, None]
+    idx0.flags.writeable = False
+    idx1.flags.writeable = False
+    return idx0, idx1
+
+
+@lru_cache(maxsize=64)
+def _analyze_custom_matrix(shape, data):
+    """CustomGateAnalyzer properties for a complex matrix given as (shape, raw bytes)."""
+    return CustomGateAnalyzer.analyze_matrix(np.frombuffer(data, dtype=complex).reshape(shape))
+
+
+def _compute_bloch_vectors(statevector, num_qubits):
+    """Bloch vector (x, y, z) of every qubit's reduced state, as a (num_qubits, 3) array."""
+    psi = np.asarray(statevector.data).ravel()
+    
+    if num_qubits == 1:
+        # A lone qubit is already pure: rho = |psi><psi|, read straight off the amplitudes
+        a, b = psi
+        rho01 = a * b.conjugate()
+        return np.array([[2 * rho01.real, -2 * rho01.imag, abs(a) ** 2 - abs(b) ** 2]])
+    
+    # Reduced density matrix entries for every qubit at once: rho00/rho11 are the
+    # probabilities with the qubit's bit clear/set, rho01 the overlap between them
+    idx0, idx1 = _bloch_index_pairs(num_qubits)
+    amp0 = psi[idx0]
+    amp1 = psi[idx1]
+    rho01 = np.einsum('qk,qk->q', amp0, amp1.conj())
+    
+    # Bloch vector components (Pauli expectation values)
+    vectors = np.empty((num_qubits, 3))
+    vectors[:, 0] = 2 * rho01.real
+    vectors[:, 1] = -2 * rho01.imag
+    vectors[:, 2] = np.einsum('qk,qk->q', amp0, amp0.conj()).real - np.einsum('qk,qk->q', amp1, amp1.conj()).real
+    return vectors
+
+
 class MainController:
     def __init__(self, view):
         self.view = view
@@ -215,8 +263,9 @@ class MainController:
             # For custom gates, display "U" with meaningful icon based on matrix
             display_gate = "U" if gate == "CUSTOM" else gate
             
-            # Pass matrix to view for custom gate rendering
-            self.view.circuit_view.place_gate_visual(display_gate, q, idx, target, params, matrix)
+            # Pass matrix (and its cached analysis) to view for custom gate rendering
+            properties = self._custom_gate_properties(matrix) if gate == "CUSTOM" else None
+            self.view.circuit_view.place_gate_visual(display_gate, q, idx, target, params, matrix, properties)
 
             # --- NEW: Draw Connectors for Multi-Qubit Gates ---
             if target is not None:
@@ -227,6 +276,13 @@ class MainController:
 
 
 
+    def _custom_gate_properties(self, matrix):
+        """Analyze a custom gate matrix once; redraws reuse the stored result."""
+        if matrix is None:
+            return None
+        matrix = np.asarray(matrix, dtype=complex)
+        return _analyze_custom_matrix(matrix.shape, matrix.tobytes())
+
     def update_full_ui(self):
         """Syncs everything."""
         self.update_code_from_model()
@@ -244,30 +300,13 @@ class MainController:
     
     def _update_qubit_visualizations(self, statevector):
         """Extract individual qubit Bloch vectors and update inline visualizations."""
-        from qiskit.quantum_info import partial_trace, DensityMatrix
+        vectors = _compute_bloch_vectors(statevector, self.model.num_qubits)
         
-        for qubit_idx in range(self.model.num_qubits):
-            # Calculate reduced density matrix for this qubit
-            traced_out = [i for i in range(self.model.num_qubits) if i != qubit_idx]
-            reduced_dm = partial_trace(statevector, traced_out)
-            
-            # Calculate Bloch vector components
-            dm_array = reduced_dm.data
-            
-            # Pauli matrices
-            sx = np.array([[0, 1], [1, 0]], dtype=complex)
-            sy = np.array([[0, -1j], [1j, 0]], dtype=complex)
-            sz = np.array([[1, 0], [0, -1]], dtype=complex)
-            
-            # Calculate expectation values
-            x = np.real(np.trace(dm_array @ sx))
-            y = np.real(np.trace(dm_array @ sy))
-            z = np.real(np.trace(dm_array @ sz))
-            
-            # Update the visualization widget
-            if qubit_idx in self.view.circuit_view.qubit_state_widgets:
-                widget = self.view.circuit_view.qubit_state_widgets[qubit_idx]
-                widget.set_state((x, y, z))
+        # Update the visualization widgets
+        widgets = self.view.circuit_view.qubit_state_widgets
+        for qubit_idx, (x, y, z) in enumerate(vectors):
+            if qubit_idx in widgets:
+                widgets[qubit_idx].set_state((x, y, z))
 
     def save_project(self):
         fname = self.view.show_save_dialog("Save Project", "JSON Files (*.json)")
@@ -0,0 +1,113 @@
+"""
+Tests for the circuit grid widget's geometry and drag-and-drop handling.
+"""
+
+import os
+
+# Run Qt without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt6.QtCore import QPoint, QPointF, Qt
+from PyQt6.QtGui import QDragEnterEvent, QDragMoveEvent, QDropEvent
+from PyQt6.QtWidgets import QApplication
+
+from views.circuit_view import CircuitGridWidget
+from views.gate_mime_data import GateMimeData
+
+
+@pytest.fixture(scope='module')
+def qapp():
+    """Returns the shared QApplication, creating it on first use."""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def grid(qapp):
+    """Returns a 3x4 grid with 100px rows, so each 50px cell has a 25px gap above and below."""
+    widget = CircuitGridWidget(3, 4)
+    widget.resize(200, 300)
+    return widget
+
+
+def _drag_event(event_type, pos, mime):
+    actions = Qt.DropAction.CopyAction | Qt.DropAction.MoveAction
+    if event_type is QDropEvent:
+        pos = QPointF(pos)
+    return event_type(pos, actions, mime, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+
+
+class TestCircuitGridGeometry:
+    """Tests for mapping between cells and widget coordinates."""
+
+    def test_cell_rect_is_centered_in_row(self, grid):
+        """Test that each cell is a cell_size square centered in its row band."""
+        rect = grid.cell_rect(1, 2)
+
+        assert (rect.x(), rect.y(), rect.width(), rect.height()) == (100, 125, 50, 50)
+
+    def test_cell_at_center_returns_cell(self, grid):
+        """Test that every cell center maps back to that cell."""
+        for q in range(3):
+            for t in range(4):
+                cell = grid.cell_at(grid.cell_center(q, t))
+                assert (cell.qubit_idx, cell.time_idx) == (q, t)
+
+    def test_cell_at_gap_returns_none(self, grid):
+        """Test that the gap between a row's band and its cell square has no cell."""
+        assert grid.cell_at(QPoint(75, 10)) is None
+        assert grid.cell_at(QPoint(75, 90)) is None
+
+    def test_cell_at_outside_grid_returns_none(self, grid):
+        """Test that positions off the grid have no cell."""
+        assert grid.cell_at(QPoint(-1, 50)) is None
+        assert grid.cell_at(QPoint(225, 50)) is None
+        assert grid.cell_at(QPoint(25, 350)) is None
+
+
+class TestCircuitGridDragDrop:
+    """Tests for dropping gates onto the grid."""
+
+    def test_drag_entering_over_gap_can_drop_on_cell(self, grid):
+        """Test that a drag entering through a gap is kept and can still drop on a cell."""
+        placed = []
+        grid.gate_placed.connect(lambda *args: placed.append(args))
+        mime = GateMimeData('H')
+        gap = QPoint(75, 10)
+        target = grid.cell_center(0, 1)
+
+        enter = _drag_event(QDragEnterEvent, gap, mime)
+        QApplication.sendEvent(grid, enter)
+        move = _drag_event(QDragMoveEvent, target, mime)
+        QApplication.sendEvent(grid, move)
+        QApplication.sendEvent(grid, _drag_event(QDropEvent, target, mime))
+
+        assert enter.isAccepted()
+        assert move.isAccepted()
+        assert placed == [('H', 0, 1)]
+        assert QApplication.overrideCursor() is None
+
+    def test_drag_move_over_gap_refuses_drop(self, grid):
+        """Test that hovering a gap shows no preview and refuses the drop there."""
+        mime = GateMimeData('X')
+        QApplication.sendEvent(grid, _drag_event(QDragEnterEvent, grid.cell_center(0, 0), mime))
+        assert grid.cells[0, 0].role == 'shadow'
+
+        move = _drag_event(QDragMoveEvent, QPoint(25, 90), mime)
+        QApplication.sendEvent(grid, move)
+
+        assert not move.isAccepted()
+        assert grid.cells[0, 0].role == 'blank'
+        grid._end_drag_hover()
+
+    def test_move_payload_emits_reposition(self, grid):
+        """Test that dropping a MOVE payload on another cell repositions the gate."""
+        moved = []
+        grid.gate_repositioned.connect(lambda *args: moved.append(args))
+        mime = GateMimeData('X', 0, 0)
+        target = grid.cell_center(2, 3)
+
+        QApplication.sendEvent(grid, _drag_event(QDragEnterEvent, target, mime))
+        QApplication.sendEvent(grid, _drag_event(QDropEvent, target, mime))
+
+        assert moved == [(0, 0, 2, 3)]
@@ -379,3 +379,97 @@ class TestCustomGateValidation:
         identity = np.eye(2)
         
         assert not np.allclose(product, identity)
+
+
+class TestCustomGatePresets:
+    """Tests for the custom gate dialog's preset matrices."""
+    
+    def test_presets_are_unitary(self):
+        """Test that every single-qubit preset satisfies U†U = I."""
+        from views.custom_gate_dialog import _PRESETS_1Q
+        for name, matrix in _PRESETS_1Q.items():
+            assert np.allclose(matrix.conj().T @ matrix, np.eye(2)), name
+    
+    def test_preset_strings_parse_back(self):
+        """Test that the preformatted preset entries parse back to the preset matrices."""
+        from views.custom_gate_dialog import _PRESETS_1Q, _PRESET_STRINGS_1Q
+        assert _PRESET_STRINGS_1Q.keys() == _PRESETS_1Q.keys()
+        for name, texts in _PRESET_STRINGS_1Q.items():
+            parsed = np.array([complex(text) for text in texts]).reshape(2, 2)
+            assert np.allclose(parsed, _PRESETS_1Q[name], rtol=0, atol=1e-6), name
+
+
+def _shape_check_matrices():
+    """Presets, structured 2-qubit gates and seeded random unitaries, as (id, matrix) pairs."""
+    from qiskit.quantum_info import random_unitary
+    from views.custom_gate_dialog import _PRESETS_1Q
+    cases = list(_PRESETS_1Q.items())
+    cases += [
+        ('identity_2q', np.eye(4)),
+        ('cz', np.diag([1, 1, 1, -1])),
+        ('cx', np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])),
+        ('controlled_s', np.diag([1, 1, 1, 1j])),
+    ]
+    cases += [(f'random_{dim}x{dim}_{seed}', random_unitary(dim, seed=seed).data)
+              for dim in (2, 4) for seed in range(5)]
+    return cases
+
+
+_SHAPE_CASES = _shape_check_matrices()
+
+
+class TestCustomGateAnalyzer:
+    """Tests for custom gate property detection."""
+    
+    @pytest.mark.parametrize('matrix', [m for _, m in _SHAPE_CASES], ids=[name for name, _ in _SHAPE_CASES])
+    def test_loop_kernel_matches_numpy_checks(self, matrix):
+        """Test that the numba loop kernel agrees with the numpy _is_* checks."""
+        from views.custom_gate_analyzer import CustomGateAnalyzer, _shape_flags_py
+        checks = np.asarray(matrix).astype(np.complex64)
+        tol = CustomGateAnalyzer.CHECK_TOL
+        
+        expected = (
+            CustomGateAnalyzer._is_diagonal(checks, tol),
+            CustomGateAnalyzer._is_real(checks, tol),
+            CustomGateAnalyzer._is_hermitian(checks, tol),
+            CustomGateAnalyzer._is_hadamard_like(checks, tol),
+            CustomGateAnalyzer._is_identity(checks, tol),
+        )
+        
+        assert tuple(bool(flag) for flag in _shape_flags_py(checks, tol)) == expected
+    
+    def test_hadamard_detected_at_single_precision(self):
+        """Test that a Hadamard rounded to float32 is still recognised."""
+        from views.custom_gate_analyzer import CustomGateAnalyzer
+        h_matrix = (np.array([[1, 1], [1, -1]]) / np.sqrt(2)).astype(np.complex64)
+        
+        props = CustomGateAnalyzer.analyze_matrix(h_matrix)
+        
+        assert props['is_hadamard_like']
+        assert props['is_hermitian']
+        assert props['gate_type'] == 'hadamard'
+    
+    def test_typed_matrix_noise_within_tolerance(self):
+        """Test that ~1e-7 off-diagonal noise from 6-digit entries keeps the shape."""
+        from views.custom_gate_analyzer import CustomGateAnalyzer
+        noise = np.array([[0, 3e-7 - 2e-7j], [-4e-7, 0]])
+        
+        identity_props = CustomGateAnalyzer.analyze_matrix(np.eye(2, dtype=complex) + noise)
+        phase_props = CustomGateAnalyzer.analyze_matrix(np.diag([1, 1j]) + noise)
+        
+        assert identity_props['is_diagonal']
+        assert identity_props['gate_type'] == 'identity'
+        assert phase_props['is_diagonal']
+        assert phase_props['gate_type'] == 'phase'
+    
+    def test_phase_gate_properties(self):
+        """Test that a diagonal phase gate is classified correctly."""
+        from views.custom_gate_analyzer import CustomGateAnalyzer
+        s_matrix = np.array([[1, 0], [0, 1j]], dtype=complex)
+        
+        props = CustomGateAnalyzer.analyze_matrix(s_matrix)
+        
+        assert props['is_diagonal']
+        assert not props['is_real']
+        assert props['gate_type'] == 'phase'
+        assert np.isclose(props['determinant'], 1j)
@@ -5,6 +5,7 @@ Tests the interaction between models, code generation, and parsing.
 """
 
 import pytest
+import numpy as np
 from models.circuit_model import CircuitModel
 from models.code_generator import QiskitCodeGenerator
 from models.code_parser import QiskitCodeParser
@@ -170,6 +171,87 @@ class TestSimulationAccuracy:
         assert counts['0'] > 1000
 
 
+class TestBlochVectors:
+    """Tests that the inline Bloch vectors match Qiskit's reduced states."""
+    
+    @staticmethod
+    def _reference_vectors(statevector, num_qubits):
+        """Bloch vectors from partial_trace and tr(rho sigma) for each qubit."""
+        from qiskit.quantum_info import partial_trace
+        paulis = (np.array([[0, 1], [1, 0]]),
+                  np.array([[0, -1j], [1j, 0]]),
+                  np.array([[1, 0], [0, -1]]))
+        vectors = []
+        for qubit in range(num_qubits):
+            rho = partial_trace(statevector, [q for q in range(num_qubits) if q != qubit]).data
+            vectors.append([np.trace(rho @ sigma).real for sigma in paulis])
+        return np.array(vectors)
+    
+    @pytest.mark.parametrize('num_qubits', [2, 3, 4, 5])
+    def test_random_states_match_partial_trace(self, num_qubits):
+        """Test random statevectors against partial_trace Pauli expectations."""
+        from qiskit.quantum_info import random_statevector
+        from controllers.main_controller import _compute_bloch_vectors
+        for seed in range(5):
+            statevector = random_statevector(2 ** num_qubits, seed=seed)
+            
+            vectors = _compute_bloch_vectors(statevector, num_qubits)
+            
+            assert vectors.shape == (num_qubits, 3)
+            assert np.allclose(vectors, self._reference_vectors(statevector, num_qubits))
+    
+    @pytest.mark.parametrize('amplitudes, expected', [
+        ([1, 0], [0, 0, 1]),
+        ([0, 1], [0, 0, -1]),
+        ([1 / np.sqrt(2), 1 / np.sqrt(2)], [1, 0, 0]),
+        ([1 / np.sqrt(2), 1j / np.sqrt(2)], [0, 1, 0]),
+    ], ids=['zero', 'one', 'plus', 'plus_i'])
+    def test_single_qubit_states(self, amplitudes, expected):
+        """Test the single-qubit shortcut on the cardinal states."""
+        from qiskit.quantum_info import Statevector
+        from controllers.main_controller import _compute_bloch_vectors
+        state = Statevector(np.array(amplitudes, dtype=complex))
+        
+        vectors = _compute_bloch_vectors(state, 1)
+        
+        assert vectors.shape == (1, 3)
+        assert np.allclose(vectors, [expected])
+        assert np.allclose(vectors, self._reference_vectors(state, 1))
+    
+    def test_bell_state_is_maximally_mixed(self):
+        """Test that both halves of a Bell state sit at the centre of the sphere."""
+        from qiskit.quantum_info import Statevector
+        from controllers.main_controller import _compute_bloch_vectors
+        bell = Statevector(np.array([1, 0, 0, 1]) / np.sqrt(2))
+        
+        vectors = _compute_bloch_vectors(bell, 2)
+        
+        assert np.allclose(vectors, 0)
+    
+    def test_plus_i_on_second_qubit(self):
+        """Test the y sign and that only qubit 1 picks it up for |+i> (x) |0>."""
+        from qiskit.quantum_info import Statevector
+        from controllers.main_controller import _compute_bloch_vectors
+        plus_i = np.array([1, 1j]) / np.sqrt(2)
+        zero = np.array([1, 0])
+        # Qiskit is little-endian: the last factor of the Kronecker product is qubit 0
+        state = Statevector(np.kron(plus_i, zero))
+        
+        vectors = _compute_bloch_vectors(state, 2)
+        
+        assert np.allclose(vectors, [[0, 0, 1], [0, 1, 0]])
+    
+    def test_one_on_qubit_zero_is_little_endian(self):
+        """Test that |1> on qubit 0 of 3 (basis index 1) flips only qubit 0."""
+        from qiskit.quantum_info import Statevector
+        from controllers.main_controller import _compute_bloch_vectors
+        state = Statevector.from_int(1, 8)
+        
+        vectors = _compute_bloch_vectors(state, 3)
+        
+        assert np.allclose(vectors, [[0, 0, -1], [0, 0, 1], [0, 0, 1]])
+
+
 class TestCodeExecution:
     """Tests that verify generated code can be executed."""
     
@@ -1,335 +1,561 @@
-from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QFrame, QMenu, QApplication, QPushButton, QMessageBox
-from PyQt6.QtCore import Qt, pyqtSignal, QMimeData, QPoint
-from PyQt6.QtGui import QDrag, QAction, QPainter, QPen, QColor, QPixmap, QFont, QFontMetrics
-from .styles import GATE_CSS
+from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QFrame, QMenu, QApplication, QPushButton, QMessageBox, QSizePolicy, QToolTip
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QPointF, QRect, QRectF, QSize, QEvent
+from PyQt6.QtGui import QDrag, QAction, QPainter, QPainterPath, QPen, QColor, QPixmap, QFont, QFontMetrics, QStaticText, QTextOption, QPixmapCache
+from .styles import COLOR_HOVER
 from .qubit_state_widget import QubitStateWidget
 from .phase_legend_widget import PhaseLegendWidget
 from .custom_gate_analyzer import CustomGateAnalyzer
+from .gate_mime_data import GateMimeData, parse_gate_mime
 import numpy as np
 
-class DropLabel(QLabel):
-    gate_placed = pyqtSignal(str, int, int)
-    gate_removed = pyqtSignal(int, int)
-    gate_repositioned = pyqtSignal(int, int, int, int)
-
-    def __init__(self, qubit_idx, time_idx):
-        super().__init__("")
-        self.setObjectName("DropZone")
-        self.setAcceptDrops(True)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+# How each drop-zone role is painted: a rect/circle of `size` px centered in the
+# zone, optional border, and the zone text in `fg` at `font_px`. bg/border of
+# None on the custom roles means "use the gate's analyzer color".
+ZONE_VISUALS = {
+    'gate':          {'shape': 'rect',   'size': 48, 'radius': 4, 'bg': '#000000', 'border': '#333333', 'border_w': 1, 'fg': '#FFFFFF', 'font_px': 14},
+    'param':         {'shape': 'rect',   'size': 48, 'radius': 4, 'bg': '#000000', 'border': '#333333', 'border_w': 1, 'fg': '#FFFFFF', 'font_px': 11},
+    'control':       {'shape': 'circle', 'size': 16, 'bg': '#000000'},
+    'target':        {'shape': 'circle', 'size': 34, 'bg': '#FFFFFF', 'border': '#000000', 'border_w': 2, 'fg': '#000000', 'font_px': 24},
+    'swap':          {'shape': None, 'fg': '#000000', 'font_px': 24},
+    'empty':         {'shape': 'rect',   'size': 50, 'radius': 4, 'bg': '#f0f0f0', 'border': '#cccccc', 'border_w': 1},
+    'shadow':        {'shape': 'rect',   'size': 50, 'radius': 8, 'bg': QColor(20, 40, 120, 115), 'fg': '#FFFFFF', 'font_px': 14},
+    'custom-gate':   {'shape': 'rect',   'size': 50, 'radius': 6, 'bg': None, 'border': None, 'border_w': 2, 'fg': '#FFFFFF', 'font_px': 18},
+    'custom-source': {'shape': 'circle', 'size': 20, 'bg': None, 'border': '#FFFFFF', 'border_w': 2},
+    'custom-target': {'shape': 'circle', 'size': 34, 'bg': None, 'border': '#FFFFFF', 'border_w': 2, 'fg': '#FFFFFF', 'font_px': 18},
+}
+ZONE_HOVER_COLOR = QColor(COLOR_HOVER)
+
+_zone_fonts = {}
+
+
+def _zone_font(pixel_size):
+    font = _zone_fonts.get(pixel_size)
+    if font is None:
+        font = QFont("Segoe UI")
+        font.setPixelSize(pixel_size)
+        font.setBold(True)
+        _zone_fonts[pixel_size] = font
+    return font
+
+
+class GridCell:
+    """Logical and painted state of one (qubit, time) slot of a CircuitGridWidget."""
+
+    __slots__ = ('grid', 'qubit_idx', 'time_idx', 'current_gate', 'target_idx', 'custom_matrix',
+                 'tooltip', 'role', 'text', 'static_text', 'color')
+
+    def __init__(self, grid, qubit_idx, time_idx):
+        self.grid = grid
         self.qubit_idx = qubit_idx
         self.time_idx = time_idx
-        
+
         self.current_gate = None
         self.target_idx = None
         self.custom_matrix = None  # For custom gates
+        self.tooltip = ""
 
-    # --- Interaction Logic ---
-    def contextMenuEvent(self, event):
-        if not self.current_gate or self.current_gate == "CONNECTOR": return
-        menu = QMenu(self)
-        delete_action = QAction("Delete", self)
-        menu.addAction(delete_action)
-        if menu.exec(event.globalPos()) == delete_action:
-            self.clear_visual()
-            self.gate_removed.emit(self.qubit_idx, self.time_idx)
-
-    def mouseMoveEvent(self, e):
-        if self.current_gate in ["CONNECTOR", "TARGET"]: return
-        if e.buttons() == Qt.MouseButton.LeftButton and self.current_gate:
-            # Store the gate info before clearing
-            dragged_gate = self.current_gate
-            dragged_target = self.target_idx
-            dragged_matrix = self.custom_matrix
-            
-            # CRITICAL: Clear this zone's visual state so it can accept drops (including back to itself)
-            self.clear_visual()
-            
-            drag = QDrag(self)
-            mime = QMimeData()
-            payload = f"MOVE:{dragged_gate}:{self.qubit_idx}:{self.time_idx}"
-            mime.setText(payload)
-            drag.setMimeData(mime)
+        # Painted visual state, see _set_visual / CircuitGridWidget.paintEvent
+        self.role = None  # Key into ZONE_VISUALS; None/"blank"/"connector" paint nothing
+        self.text = ""
+        self.static_text = QStaticText()
+        self.color = None  # Analyzer color for custom roles
 
-            # Create a styled, semi-transparent pixmap for the drag (shadow-like)
-            # Increased size for better visual feedback and larger drop target
-            pixmap_size = 70
-            pixmap = QPixmap(pixmap_size, pixmap_size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            rect = pixmap.rect().adjusted(4, 4, -4, -4)
-            painter.setBrush(QColor(20, 40, 120, 160))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, 8, 8)
-            # Text
-            font = QFont("Sans", 10, QFont.Weight.Bold)
-            painter.setFont(font)
-            painter.setPen(QColor(255, 255, 255, 220))
-            fm = QFontMetrics(font)
-            tx = (pixmap.width() - fm.horizontalAdvance(dragged_gate)) // 2
-            ty = (pixmap.height() + fm.ascent() - fm.descent()) // 2
-            painter.drawText(tx, ty, dragged_gate)
-            painter.end()
-
-            drag.setPixmap(pixmap)
-            # Hotspot should be at the center of the pixmap, not widget coordinates
-            drag.setHotSpot(QPoint(pixmap_size // 2, pixmap_size // 2))
-
-            # Change cursor to indicate move
-            QApplication.setOverrideCursor(Qt.CursorShape.ClosedHandCursor)
-            try:
-                drag.exec(Qt.DropAction.MoveAction)
-            finally:
-                QApplication.restoreOverrideCursor()
-
-    def dragEnterEvent(self, event):
-        if self.current_gate == "CONNECTOR": 
-            event.ignore(); return
-        # Show a lightweight shadow/preview when dragging over this zone
-        if event.mimeData().hasText():
-            text = event.mimeData().text()
-            # Parse MOVE payloads: "MOVE:NAME:old_q:old_t"
-            if text.startswith("MOVE:"):
-                _, gate_name, _, _ = text.split(":")
-            else:
-                gate_name = text
-            self.show_shadow(gate_name)
-            # change cursor based on action
-            if text.startswith("MOVE:"):
-                QApplication.setOverrideCursor(Qt.CursorShape.ClosedHandCursor)
-            else:
-                QApplication.setOverrideCursor(Qt.CursorShape.DragCopyCursor)
-            event.acceptProposedAction()
-        else:
-            event.ignore()
-
-    def dragMoveEvent(self, event):
-        if self.current_gate == "CONNECTOR": event.ignore(); return
-        if event.mimeData().hasText():
-            # keep the shadow updated (in case different gate types show different sizes)
-            text = event.mimeData().text()
-            if text.startswith("MOVE:"):
-                _, gate_name, _, _ = text.split(":")
-            else:
-                gate_name = text
-            self.show_shadow(gate_name)
-            event.acceptProposedAction()
-
-    def dropEvent(self, event):
-        if self.current_gate == "CONNECTOR": 
-            event.ignore(); return
-        data = event.mimeData().text()
-        # Clear any preview and restore cursor
-        self.clear_shadow()
-        QApplication.restoreOverrideCursor()
+    # --- Visual Logic ---
 
-        if data.startswith("MOVE:"):
-            _, gate_name, old_q, old_t = data.split(":")
-            old_q, old_t = int(old_q), int(old_t)
-            # if moving within same position, ignore
-            if old_q == self.qubit_idx and old_t == self.time_idx:
-                event.ignore(); return
+    def _set_gate(self, gate):
+        """Update current_gate, notifying the grid so it can track placed gates."""
+        changed = gate != self.current_gate
+        self.current_gate = gate
+        if changed:
+            self.grid._on_gate_state_changed(self.qubit_idx, self.time_idx, gate)
 
-            # Emit reposition without aligning left
-            self.gate_repositioned.emit(old_q, old_t, self.qubit_idx, self.time_idx)
-        else:
-            self.gate_placed.emit(data, self.qubit_idx, self.time_idx)
-        event.acceptProposedAction()
-
-    def dragLeaveEvent(self, event):
-        # Clear preview when drag leaves
-        self.clear_shadow()
-        QApplication.restoreOverrideCursor()
-        event.accept()
+    def _set_target(self, target_idx):
+        """Update target_idx, notifying the grid so it can track connector lines."""
+        old_target = self.target_idx
+        self.target_idx = target_idx
+        if old_target != target_idx:
+            self.grid._on_connector_changed(self.qubit_idx, self.time_idx, old_target, target_idx)
 
-    # --- Visual Logic ---
-    
-    def set_visual_gate(self, text, params=None, matrix=None):
-        self.current_gate = text
-        self.target_idx = None
+    def _set_visual(self, role, text="", color=None):
+        """Switch what this cell paints and repaint just its square."""
+        if (role, text, color) == (self.role, self.text, self.color):
+            return
+        if text != self.text:
+            self.static_text = self._make_static_text(text)
+            self.text = text
+        self.role = role
+        self.color = color
+        self.grid.update_cell(self.qubit_idx, self.time_idx)
+
+    def _make_static_text(self, text):
+        if "\n" not in text:
+            return QStaticText(text)
+        # Parameterized gates show two centered lines ("RX" over "1.57")
+        static_text = QStaticText(text.replace("\n", "<br>"))
+        static_text.setTextFormat(Qt.TextFormat.RichText)
+        static_text.setTextWidth(self.grid.cell_size)
+        static_text.setTextOption(QTextOption(Qt.AlignmentFlag.AlignHCenter))
+        return static_text
+
+    def set_visual_gate(self, text, params=None, matrix=None, properties=None):
+        self._set_gate(text)
+        self._set_target(None)
         self.custom_matrix = matrix
         display_text = text
-        style = GATE_CSS
+        role, color = "gate", None
         
         # Handle custom gates with meaningful icons
         if text == "U" and matrix is not None:
-            properties = CustomGateAnalyzer.analyze_matrix(matrix)
+            properties = properties or CustomGateAnalyzer.analyze_matrix(matrix)
             display_text = properties['icon']
             
             # Color-coded background based on gate type
+            role = "custom-gate"
             color = properties['color']
-            style = f"""
-                background-color: {color};
-                color: white;
-                border: 2px solid {color};
-                border-radius: 6px;
-                font-family: 'Segoe UI', sans-serif;
-                font-weight: bold;
-                font-size: 18px;
-                min-width: 46px;
-                min-height: 46px;
-            """
             
             # Set tooltip with gate information
-            tooltip = CustomGateAnalyzer.get_tooltip(properties)
-            self.setToolTip(tooltip)
+            self.tooltip = CustomGateAnalyzer.get_tooltip(properties)
         elif params is not None:
             short_param = f"{float(params):.2f}"
             display_text = f"{text}\n{short_param}"
-            style += "font-size: 11px;"
+            role = "param"
             
-        self.setText(display_text)
-        self.setStyleSheet(style)
+        self._set_visual(role, display_text, color)
 
-    def set_visual_source(self, gate_type, target_idx, matrix=None):
-        self.current_gate = gate_type
-        self.target_idx = target_idx
+    def set_visual_source(self, gate_type, target_idx, matrix=None, properties=None):
+        self._set_gate(gate_type)
+        self._set_target(target_idx)
         self.custom_matrix = matrix
         
         # Handle custom gate source (control qubit for 2-qubit custom gates)
         if gate_type == "U" and matrix is not None:
-            properties = CustomGateAnalyzer.analyze_matrix(matrix)
-            color = properties['color']
+            properties = properties or CustomGateAnalyzer.analyze_matrix(matrix)
             
             # For custom gates, use a colored control dot
-            style = f"""
-                background-color: {color}; 
-                border-radius: 8px; 
-                min-width: 16px; min-height: 16px; 
-                max-width: 16px; max-height: 16px;
-                margin: 17px;
-                border: 2px solid white;
-            """
             
-            tooltip = f"Custom {properties['qubit_count']}-qubit gate (control)\n{CustomGateAnalyzer.get_tooltip(properties)}"
-            self.setToolTip(tooltip)
-            self.setText("")
-            self.setStyleSheet(style)
+            self.tooltip = f"Custom {properties['qubit_count']}-qubit gate (control)\n{CustomGateAnalyzer.get_tooltip(properties)}"
+            self._set_visual("custom-source", "", properties['color'])
             return
         
         # Default: Control Dot (●)
         # Small, solid black circle centered in the box
         symbol = ""
-        style = """
-            background-color: #000000; 
-            border-radius: 8px; 
-            min-width: 16px; min-height: 16px; 
-            max-width: 16px; max-height: 16px;
-            margin: 17px; /* Centers the 16px dot in 50px box */
-        """
+        role = "control"
         
         if gate_type == "SWAP":
             symbol = "✖"
-            style = "background-color: transparent; color: #000000; font-size: 24px; font-weight: bold;"
+            role = "swap"
             
-        self.setText(symbol)
-        self.setStyleSheet(style)
+        self._set_visual(role, symbol)
 
-    def set_visual_target(self, gate_type, matrix=None):
-        self.current_gate = "TARGET"
-        self.target_idx = None
+    def set_visual_target(self, gate_type, matrix=None, properties=None):
+        self._set_gate("TARGET")
+        self._set_target(None)
         self.custom_matrix = matrix
         
         # Handle custom gate target (for 2-qubit custom gates)
         if gate_type == "U" and matrix is not None:
-            properties = CustomGateAnalyzer.analyze_matrix(matrix)
-            color = properties['color']
+            properties = properties or CustomGateAnalyzer.analyze_matrix(matrix)
             
             # For custom gates, use a colored circle with the gate icon
             symbol = properties['icon']
-            style = f"""
-                background-color: {color}; 
-                border: 2px solid white;
-                border-radius: 15px;
-                color: white; 
-                font-size: 18px; 
-                font-weight: bold;
-                min-width: 30px; min-height: 30px;
-                max-width: 30px; max-height: 30px;
-            """
             
-            tooltip = f"Custom {properties['qubit_count']}-qubit gate (target)\n{CustomGateAnalyzer.get_tooltip(properties)}"
-            self.setToolTip(tooltip)
-            self.setText(symbol)
-            self.setStyleSheet(style)
+            self.tooltip = f"Custom {properties['qubit_count']}-qubit gate (target)\n{CustomGateAnalyzer.get_tooltip(properties)}"
+            self._set_visual("custom-target", symbol, properties['color'])
             return
         
         # Default: CNOT Target (⊕)
-        # Open circle with Cross. 
-        # We achieve this with a Border (Circle) and Text (+)
         symbol = "+"
-        style = """
-            background-color: #FFFFFF; 
-            border: 2px solid #000000; 
-            border-radius: 15px; /* Makes it a 30px circle */
-            color: #000000; 
-            font-size: 24px; 
-            font-weight: bold;
-            min-width: 30px; min-height: 30px;
-            max-width: 30px; max-height: 30px;
-        """
+        role = "target"
         
         if gate_type == "CZ":
             # CZ Target is also a Dot (●)
             symbol = ""
-            style = """
-                background-color: #000000; 
-                border-radius: 8px; 
-                min-width: 16px; min-height: 16px; 
-                max-width: 16px; max-height: 16px;
-                margin: 17px;
-            """
+            role = "control"
         elif gate_type == "SWAP":
             symbol = "✖"
-            style = "background-color: transparent; color: #000000; font-size: 24px; font-weight: bold;"
+            role = "swap"
 
-        self.setText(symbol)
-        self.setStyleSheet(style)
+        self._set_visual(role, symbol)
 
     def set_visual_connector(self):
-        self.current_gate = "CONNECTOR"
-        self.target_idx = None
-        self.setText("")
-        self.setStyleSheet("background-color: transparent; border: none;")
+        self._set_gate("CONNECTOR")
+        self._set_target(None)
+        self._set_visual("connector")
 
     def clear_visual(self):
         """Reset the visual and logical state of the slot."""
-        self.current_gate = None
-        self.target_idx = None
+        self._set_gate(None)
+        self._set_target(None)
         self.custom_matrix = None
-        self.setText("")
-        # Reset to default gate style instead of empty string
-        self.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                border: 1px solid #ccc;
-                border-radius: 4px;
-            }
-        """)
-        self.setToolTip("")  # Clear tooltips
-        # EXPLICITLY RE-ENABLE DROP ACCEPTANCE
-        self.setAcceptDrops(True)
-        # CRITICAL: Ensure the full 50x50 area is the drop target
-        # Clear any masks and force geometry update
-        self.clearMask()
-        self.setFixedSize(50, 50)
-        self.update()
+        # Reset to the empty-slot visual instead of a bare zone
+        self._set_visual("empty")
+        self.tooltip = ""  # Clear tooltips
 
     # --- Preview / Shadow helpers ---
     def show_shadow(self, gate_text):
         # Don't overwrite an actual gate visual; show a lightweight translucent preview instead
         if self.current_gate is not None:
             return
-        style = f"background-color: rgba(20,40,120,0.45); color: white; border-radius: 8px; font-weight: bold;"
-        self.setText(gate_text)
-        self.setStyleSheet(style)
+        self._set_visual("shadow", gate_text)
 
     def clear_shadow(self):
         # Only clear if it is a preview (i.e., current_gate is None)
         if self.current_gate is None:
-            self.setText("")
-            self.setStyleSheet("border: none; background-color: transparent;")
+            self._set_visual("blank")
+
+
+class CircuitGridWidget(QWidget):
+    """
+    The drop-zone grid of the circuit: one widget that paints every cell and
+    connector itself and maps mouse/drag events to (qubit, time) cells.
+    """
+    gate_placed = pyqtSignal(str, int, int)
+    gate_removed = pyqtSignal(int, int)
+    gate_repositioned = pyqtSignal(int, int, int, int)
+
+    def __init__(self, num_qubits, num_steps, cell_size=50, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)  # HoverMove events drive the hover highlight
+        self.num_qubits = num_qubits
+        self.num_steps = num_steps
+        self.cell_size = cell_size
+        # Cells are cell_size wide side by side; each row is as tall as the
+        # layout makes it, with the cell square centered vertically
+        self.setMinimumSize(num_steps * cell_size, num_qubits * cell_size)
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Preferred)
+
+        self.cells = np.empty((num_qubits, num_steps), dtype=object)  # cells[q, t] -> GridCell
+        for q in range(num_qubits):
+            for t in range(num_steps):
+                self.cells[q, t] = GridCell(self, q, t)
+        self._connectors = set()  # (q, t, target_q) for every cell drawing a connector line
+        self._placed = {}  # (q, t) -> current_gate for every non-empty cell
+
+        self._hover_cell = None  # Untouched cell under the mouse
+        self._press_cell = None  # Cell the left button went down on, for starting drags
+        self._drag_preview_name = None  # Gate name of the drag currently over the grid
+        self._shadow_cell = None  # Cell showing that drag's preview
+
+    def sizeHint(self):
+        return QSize(self.num_steps * self.cell_size, self.num_qubits * self.cell_size)
+
+    # --- Geometry ---
+    def cell_rect(self, q, t):
+        """The square painted for (q, t), in this widget's coordinates."""
+        row_top = q * self.height() // self.num_qubits
+        row_height = (q + 1) * self.height() // self.num_qubits - row_top
+        return QRect(t * self.cell_size, row_top + (row_height - self.cell_size) // 2,
+                     self.cell_size, self.cell_size)
+
+    def cell_center(self, q, t):
+        return self.cell_rect(q, t).center()
+
+    def cell_at(self, pos):
+        """Return the GridCell whose square contains `pos`, or None."""
+        x, y = int(pos.x()), int(pos.y())
+        if x < 0 or y < 0:
+            return None
+        t = x // self.cell_size
+        q = y * self.num_qubits // max(self.height(), 1)
+        cell = self.cell(q, t)
+        if cell is None or not self.cell_rect(q, t).contains(x, y):
+            return None
+        return cell
+
+    def cell(self, q, t):
+        """Return the GridCell at (q, t), or None if it is off the grid."""
+        if 0 <= q < self.num_qubits and 0 <= t < self.num_steps:
+            return self.cells[q, t]
+        return None
+
+    def update_cell(self, q, t):
+        self.update(self.cell_rect(q, t))
+
+    def _connector_rect(self, q, t, target):
+        """Bounding rect of the connector line from (q, t) to (target, t), or None if off the grid."""
+        if self.cell(target, t) is None:
+            return None
+        p1 = self.cell_center(q, t)
+        p2 = self.cell_center(target, t)
+        # Pad by the 2px pen width
+        return QRect(p1, p2).normalized().adjusted(-2, -2, 2, 2)
+
+    # --- Cell bookkeeping (called by GridCell) ---
+    def _on_connector_changed(self, q, t, old_target, new_target):
+        # Repaint only the strip covered by the removed/added line
+        if old_target is not None:
+            self._connectors.discard((q, t, old_target))
+            rect = self._connector_rect(q, t, old_target)
+            if rect is not None:
+                self.update(rect)
+        if new_target is not None:
+            self._connectors.add((q, t, new_target))
+            rect = self._connector_rect(q, t, new_target)
+            if rect is not None:
+                self.update(rect)
+
+    def _on_gate_state_changed(self, q, t, gate):
+        if gate:
+            self._placed[(q, t)] = gate
+        else:
+            self._placed.pop((q, t), None)
+
+    def placed_gates(self):
+        """List every occupied cell in (qubit, position) order."""
+        return [{'gate': gate, 'qubit': q, 'position': t}
+                for (q, t), gate in sorted(self._placed.items())]
+
+    # --- Painting ---
+    def paintEvent(self, event):
+        dirty = event.rect()
+        painter = QPainter(self)
+
+        # Connectors go underneath the cells. No antialiasing: they are always
+        # vertical (same time step), so aliased strokes are exact and cheaper
+        pen = QPen(QColor("#333333"))
+        pen.setWidth(2)
+        painter.setPen(pen)
+        path = QPainterPath()
+        for q, t, target in self._connectors:
+            rect = self._connector_rect(q, t, target)
+            if rect is not None and rect.intersects(dirty):
+                path.moveTo(QPointF(self.cell_center(q, t)))
+                path.lineTo(QPointF(self.cell_center(target, t)))
+        painter.drawPath(path)
+
+        # Only the columns touching the dirty region need painting
+        first_t = max(dirty.left() // self.cell_size, 0)
+        last_t = min(dirty.right() // self.cell_size, self.num_steps - 1)
+        for q in range(self.num_qubits):
+            for t in range(first_t, last_t + 1):
+                rect = self.cell_rect(q, t)
+                if not rect.intersects(dirty):
+                    continue
+                cell = self.cells[q, t]
+                visual = ZONE_VISUALS.get(cell.role)
+                if visual is None:
+                    # Untouched cell: transparent, highlighted on hover
+                    if cell.role is None and cell is self._hover_cell:
+                        painter.setPen(Qt.PenStyle.NoPen)
+                        painter.setBrush(ZONE_HOVER_COLOR)
+                        painter.drawRoundedRect(QRectF(rect), 4, 4)
+                    continue
+                painter.drawPixmap(rect.topLeft(), self._tile_pixmap(cell, visual))
+        painter.end()
+
+    def _tile_pixmap(self, cell, visual):
+        """Identical tiles (every CX target, every "H" box, ...) share one prerendered pixmap."""
+        ratio = self.devicePixelRatioF()
+        size = self.cell_size
+        key = f"zone:{cell.role}:{cell.color}:{cell.text}:{size}x{size}@{ratio}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(round(size * ratio), round(size * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            tile_painter = QPainter(pixmap)
+            self._paint_tile(tile_painter, visual, cell)
+            tile_painter.end()
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def _paint_tile(self, painter, visual, cell):
+        """Draw `cell`'s shape and text for `visual` (a ZONE_VISUALS entry)."""
+        cell_size = self.cell_size
+        shape = visual['shape']
+        if shape is not None:
+            bg = visual['bg'] if visual['bg'] is not None else cell.color
+            border = visual.get('border') or cell.color
+            border_w = visual.get('border_w', 0)
+            size = visual['size']
+            # Inset by half the pen so the stroke stays inside the shape
+            inset = border_w / 2
+            rect = QRectF((cell_size - size) / 2 + inset, (cell_size - size) / 2 + inset,
+                          size - border_w, size - border_w)
+            painter.setPen(QPen(QColor(border), border_w) if border_w else Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(bg))
+            if shape == 'circle':
+                # Circles need antialiasing to look round; axis-aligned boxes do not
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+                painter.drawEllipse(rect)
+            else:
+                painter.drawRoundedRect(rect, visual['radius'], visual['radius'])
+
+        if cell.text and 'fg' in visual:
+            font = _zone_font(visual['font_px'])
+            painter.setFont(font)
+            painter.setPen(QColor(visual['fg']))
+            cell.static_text.prepare(font=font)
+            text_size = cell.static_text.size()
+            painter.drawStaticText(QPointF((cell_size - text_size.width()) / 2,
+                                           (cell_size - text_size.height()) / 2),
+                                   cell.static_text)
+
+    # --- Interaction Logic ---
+    def event(self, event):
+        etype = event.type()
+        if etype in (QEvent.Type.HoverEnter, QEvent.Type.HoverMove):
+            self._set_hover_cell(self.cell_at(event.position()))
+        elif etype == QEvent.Type.HoverLeave:
+            self._set_hover_cell(None)
+        elif etype == QEvent.Type.ToolTip:
+            cell = self.cell_at(event.pos())
+            if cell is not None and cell.tooltip:
+                # Tie the tooltip to the cell so it hides once the cursor moves off it
+                QToolTip.showText(event.globalPos(), cell.tooltip, self,
+                                  self.cell_rect(cell.qubit_idx, cell.time_idx))
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
+    def _set_hover_cell(self, cell):
+        if cell is self._hover_cell:
+            return
+        for old_or_new in (self._hover_cell, cell):
+            if old_or_new is not None and old_or_new.role is None:
+                self.update_cell(old_or_new.qubit_idx, old_or_new.time_idx)
+        self._hover_cell = cell
+
+    def contextMenuEvent(self, event):
+        cell = self.cell_at(event.pos())
+        if cell is None or not cell.current_gate or cell.current_gate == "CONNECTOR": return
+        menu = QMenu(self)
+        delete_action = QAction("Delete", self)
+        menu.addAction(delete_action)
+        if menu.exec(event.globalPos()) == delete_action:
+            cell.clear_visual()
+            self.gate_removed.emit(cell.qubit_idx, cell.time_idx)
+
+    def mousePressEvent(self, e):
+        self._press_cell = self.cell_at(e.position()) if e.button() == Qt.MouseButton.LeftButton else None
+        super().mousePressEvent(e)
+
+    def mouseReleaseEvent(self, e):
+        self._press_cell = None
+        super().mouseReleaseEvent(e)
+
+    def mouseMoveEvent(self, e):
+        cell = self._press_cell
+        if cell is None or cell.current_gate in ["CONNECTOR", "TARGET"]: return
+        if e.buttons() == Qt.MouseButton.LeftButton and cell.current_gate:
+            self._press_cell = None
+            # Store the gate info before clearing
+            dragged_gate = cell.current_gate
+            dragged_matrix = cell.custom_matrix
+            
+            # CRITICAL: Clear this cell's visual state so it can accept drops (including back to itself)
+            cell.clear_visual()
+            
+            drag = QDrag(self)
+            mime = GateMimeData(dragged_gate, cell.qubit_idx, cell.time_idx, dragged_matrix)
+            drag.setMimeData(mime)
+
+            # Create a styled, semi-transparent pixmap for the drag (shadow-like)
+            # Increased size for better visual feedback and larger drop target
+            pixmap_size = 70
+            pixmap = QPixmap(pixmap_size, pixmap_size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            rect = pixmap.rect().adjusted(4, 4, -4, -4)
+            painter.setBrush(QColor(20, 40, 120, 160))
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.drawRoundedRect(rect, 8, 8)
+            # Text
+            font = QFont("Sans", 10, QFont.Weight.Bold)
+            painter.setFont(font)
+            painter.setPen(QColor(255, 255, 255, 220))
+            fm = QFontMetrics(font)
+            tx = (pixmap.width() - fm.horizontalAdvance(dragged_gate)) // 2
+            ty = (pixmap.height() + fm.ascent() - fm.descent()) // 2
+            painter.drawText(tx, ty, dragged_gate)
+            painter.end()
+
+            drag.setPixmap(pixmap)
+            # Hotspot should be at the center of the pixmap, not widget coordinates
+            drag.setHotSpot(QPoint(pixmap_size // 2, pixmap_size // 2))
+
+            # Change cursor to indicate move
+            QApplication.setOverrideCursor(Qt.CursorShape.ClosedHandCursor)
+            try:
+                drag.exec(Qt.DropAction.MoveAction)
+            finally:
+                QApplication.restoreOverrideCursor()
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasText():
+            gate_name, old_q, _ = parse_gate_mime(event.mimeData())
+            # Parsed once here; dragMoveEvent reuses it for the rest of the hover
+            self._drag_preview_name = gate_name
+            # change cursor based on action
+            if old_q is not None:
+                QApplication.setOverrideCursor(Qt.CursorShape.ClosedHandCursor)
+            else:
+                QApplication.setOverrideCursor(Qt.CursorShape.DragCopyCursor)
+            self._move_shadow(self.cell_at(event.position()))
+            # Accept the drag even when it enters over a gap between cells: Qt only
+            # sends DragMove/Drop to the widget that accepted DragEnter. Whether the
+            # cell under the cursor takes the drop is decided per move and on drop.
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):
+        if self._drag_preview_name is None:
+            event.ignore(); return
+        cell = self.cell_at(event.position())
+        self._move_shadow(cell)
+        # Only empty cells accept the drop
+        if cell is None or cell.current_gate == "CONNECTOR":
+            event.ignore()
+        else:
+            event.acceptProposedAction()
+
+    def _move_shadow(self, cell):
+        """Show the drag preview on `cell` (None clears it); connector cells get no preview."""
+        if cell is self._shadow_cell:
+            return
+        if self._shadow_cell is not None:
+            self._shadow_cell.clear_shadow()
+        self._shadow_cell = cell
+        if cell is not None and cell.current_gate != "CONNECTOR":
+            cell.show_shadow(self._drag_preview_name)
+
+    def _end_drag_hover(self):
+        if self._shadow_cell is not None:
+            self._shadow_cell.clear_shadow()
+        self._shadow_cell = None
+        if self._drag_preview_name is not None:
+            self._drag_preview_name = None
+            QApplication.restoreOverrideCursor()
+
+    def dropEvent(self, event):
+        cell = self.cell_at(event.position())
+        # Clear any preview and restore cursor
+        self._end_drag_hover()
+        if cell is None or cell.current_gate == "CONNECTOR": 
+            event.ignore(); return
+        gate_name, old_q, old_t = parse_gate_mime(event.mimeData())
+
+        if old_q is not None:
+            # if moving within same position, ignore
+            if old_q == cell.qubit_idx and old_t == cell.time_idx:
+                event.ignore(); return
+
+            # Emit reposition without aligning left
+            self.gate_repositioned.emit(old_q, old_t, cell.qubit_idx, cell.time_idx)
+        else:
+            self.gate_placed.emit(gate_name, cell.qubit_idx, cell.time_idx)
+        event.acceptProposedAction()
+
+    def dragLeaveEvent(self, event):
+        # Clear preview when drag leaves
+        self._end_drag_hover()
+        event.accept()
 
 
 class CircuitView(QWidget):
@@ -344,7 +570,6 @@ class CircuitView(QWidget):
         self.grid.setSpacing(0)
         self.num_qubits = num_qubits
         self.num_steps = num_steps
-        self.drop_zones = {}
         self.qubit_state_widgets = {}  # Store inline visualization widgets
         self.setup_grid()
 
@@ -353,7 +578,7 @@ class CircuitView(QWidget):
         self.display_button.clicked.connect(self.show_circuit_array)
         self.grid.addWidget(self.display_button, num_qubits, 0, 1, num_steps + 1)
 
-        # Add a button to display the visual state of the circuit (drop_zones)
+        # Add a button to display the visual state of the circuit (zones)
         self.display_visual_button = QPushButton("Show Visual State", self)
         self.display_visual_button.clicked.connect(self.show_visual_state)
         self.grid.addWidget(self.display_visual_button, num_qubits + 1, 0, 1, num_steps + 1)
@@ -376,88 +601,66 @@ class CircuitView(QWidget):
             wire = QFrame()
             wire.setObjectName("CircuitLine")
             self.grid.addWidget(wire, q, 1, 1, self.num_steps, Qt.AlignmentFlag.AlignVCenter)
-
-            for t in range(self.num_steps):
-                zone = DropLabel(q, t)
-                zone.setFixedSize(50, 50)
-                zone.gate_placed.connect(self.gate_dropped)
-                zone.gate_removed.connect(self.gate_deleted)
-                zone.gate_repositioned.connect(self.gate_moved)
-                self.grid.addWidget(zone, q, t+1, Qt.AlignmentFlag.AlignCenter)
-                self.drop_zones[(q, t)] = zone
             
             # Add inline qubit state visualization at the end of the line
             state_widget = QubitStateWidget(q)
             self.grid.addWidget(state_widget, q, self.num_steps + 1, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
             self.qubit_state_widgets[q] = state_widget
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Black/Dark Gray line for CNOT connector
-        pen = QPen(QColor("#333333"))
-        pen.setWidth(2)
-        painter.setPen(pen)
-
-        for (q, t), zone in self.drop_zones.items():
-            if zone.target_idx is not None:
-                target_zone = self.drop_zones.get((zone.target_idx, t))
-                if target_zone:
-                    p1 = zone.mapTo(self, zone.rect().center())
-                    p2 = target_zone.mapTo(self, target_zone.rect().center())
-                    painter.drawLine(p1, p2)
-
+        # One widget paints every drop zone, on top of the wires
+        self.grid_widget = CircuitGridWidget(self.num_qubits, self.num_steps)
+        self.grid_widget.gate_placed.connect(self.gate_dropped)
+        self.grid_widget.gate_removed.connect(self.gate_deleted)
+        self.grid_widget.gate_repositioned.connect(self.gate_moved)
+        self.grid.addWidget(self.grid_widget, 0, 1, self.num_qubits, self.num_steps)
+        self.zones = self.grid_widget.cells  # zones[q, t] -> GridCell
 
+    def _zone_at(self, q, t):
+        """Return the GridCell at (q, t), or None if it is off the grid."""
+        return self.grid_widget.cell(q, t)
 
     def clear_grid(self):
-        for zone in self.drop_zones.values():
+        for zone in self.zones.flat:
             zone.clear_visual()
-        self.update()
-
-    def place_gate_visual(self, gate_text, q, t, target_index=None, params=None, matrix=None):
-        if (q, t) not in self.drop_zones: return
-        zone = self.drop_zones[(q, t)]
+        self.grid_widget.update()
+
+    def place_gate_visual(self, gate_text, q, t, target_index=None, params=None, matrix=None, properties=None):
+        """Place a gate visual; `properties` are the matrix's analyzer results if the caller has them."""
+        zone = self._zone_at(q, t)
+        if zone is None: return
+        if properties is None and gate_text == "U" and matrix is not None:
+            # Analyze once here so source and target share the result
+            properties = CustomGateAnalyzer.analyze_matrix(matrix)
         if target_index is not None:
-            zone.set_visual_source(gate_text, target_index, matrix)
-            if (target_index, t) in self.drop_zones:
-                self.drop_zones[(target_index, t)].set_visual_target(gate_text, matrix)
+            zone.set_visual_source(gate_text, target_index, matrix, properties)
+            target_zone = self._zone_at(target_index, t)
+            if target_zone is not None:
+                target_zone.set_visual_target(gate_text, matrix, properties)
         else:
-            zone.set_visual_gate(gate_text, params, matrix)
-        self.update()
+            zone.set_visual_gate(gate_text, params, matrix, properties)
+        # No full update(): cells repaint their own square and connector
+        # changes invalidate just their own strip (see CircuitGridWidget._on_connector_changed)
 
     def place_connector_visual(self, q, t):
-        if (q, t) in self.drop_zones:
-            self.drop_zones[(q, t)].set_visual_connector()
+        zone = self._zone_at(q, t)
+        if zone is not None:
+            zone.set_visual_connector()
+
+    def _placed_gates(self):
+        """List every occupied zone in (qubit, position) order."""
+        return self.grid_widget.placed_gates()
 
     def show_circuit_array(self):
-        circuit_array = []
-        for (q, t), zone in self.drop_zones.items():
-            if zone.current_gate:
-                circuit_array.append({
-                    'gate': zone.current_gate,
-                    'qubit': q,
-                    'position': t
-                })
         # Display the circuit array in a QMessageBox
-        QMessageBox.information(self, "Circuit Array", str(circuit_array))
+        QMessageBox.information(self, "Circuit Array", str(self._placed_gates()))
 
     def show_visual_state(self):
-        visual_state = []
-        for (q, t), zone in self.drop_zones.items():
-            if zone.current_gate:
-                visual_state.append({
-                    'gate': zone.current_gate,
-                    'qubit': q,
-                    'position': t
-                })
-        QMessageBox.information(self, "Visual State", str(visual_state))
+        QMessageBox.information(self, "Visual State", str(self._placed_gates()))
 
     def show_all_zone_states(self):
         """DEBUG: Show ALL zones with their current_gate values (including None)."""
         all_zones = []
-        for (q, t), zone in self.drop_zones.items():
+        for (q, t), zone in np.ndenumerate(self.zones):
             all_zones.append({
                 'qubit': q,
                 'position': t,
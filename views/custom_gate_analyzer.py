@@ -7,6 +7,52 @@ Analyzes unitary matrices to determine visual properties for meaningful icons.
 import numpy as np
 from typing import Dict, Any, Tuple
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the numpy checks
+    njit = None
+
+
+def _close(a, b, tol):
+    """Same test as np.isclose with the default rtol."""
+    return abs(a - b) <= tol + 1e-5 * abs(b)
+
+
+def _shape_flags_py(m, tol):
+    """
+    Loop form of the shape predicates, compiled into _shape_flags when numba is available.
+    
+    Returns (is_diagonal, is_real, is_hermitian, is_hadamard_like, is_identity).
+    """
+    n = m.shape[0]
+    is_diagonal = True
+    is_real = True
+    is_hermitian = True
+    is_identity = True
+    is_hadamard_like = m.shape[0] == 2 and m.shape[1] == 2
+    expected_mag = 1 / np.sqrt(2)
+    for i in range(n):
+        for j in range(n):
+            v = m[i, j]
+            if i != j and not _close(v, 0, tol):
+                is_diagonal = False
+            if not _close(v.imag, 0, tol):
+                is_real = False
+            if not _close(v, m[j, i].conjugate(), tol):
+                is_hermitian = False
+            if not _close(v, 1.0 if i == j else 0.0, tol):
+                is_identity = False
+            if is_hadamard_like and not _close(abs(v), expected_mag, tol):
+                is_hadamard_like = False
+    return is_diagonal, is_real, is_hermitian, is_hadamard_like, is_identity
+
+
+if njit is not None:
+    _close = njit(cache=True)(_close)
+    _shape_flags = njit(cache=True)(_shape_flags_py)
+else:
+    _shape_flags = None
+
 
 class CustomGateAnalyzer:
     """Analyzes custom gate matrices to determine visual representation."""
@@ -23,6 +69,9 @@ class CustomGateAnalyzer:
         'special': '#c0392b',       # Dark red - special unitary (det=1)
     }
     
+    # Tolerance for the shape predicates, which run on a complex64 copy
+    CHECK_TOL = 1e-5
+    
     @staticmethod
     def analyze_matrix(matrix: np.ndarray) -> Dict[str, Any]:
         """
@@ -57,12 +106,19 @@ class CustomGateAnalyzer:
         dim = matrix.shape[0]
         qubit_count = int(np.log2(dim))
         
-        # Check properties
-        is_diagonal = CustomGateAnalyzer._is_diagonal(matrix)
-        is_real = CustomGateAnalyzer._is_real(matrix)
-        is_hermitian = CustomGateAnalyzer._is_hermitian(matrix)
-        is_hadamard_like = CustomGateAnalyzer._is_hadamard_like(matrix)
-        is_identity = CustomGateAnalyzer._is_identity(matrix)
+        # Check properties. The tolerance-based shape checks only need single
+        # precision; the determinant below still uses the full-precision matrix.
+        checks = matrix.astype(np.complex64, copy=False)
+        tol = CustomGateAnalyzer.CHECK_TOL
+        if _shape_flags is not None:
+            (is_diagonal, is_real, is_hermitian,
+             is_hadamard_like, is_identity) = _shape_flags(checks, tol)
+        else:
+            is_diagonal = CustomGateAnalyzer._is_diagonal(checks, tol)
+            is_real = CustomGateAnalyzer._is_real(checks, tol)
+            is_hermitian = CustomGateAnalyzer._is_hermitian(checks, tol)
+            is_hadamard_like = CustomGateAnalyzer._is_hadamard_like(checks, tol)
+            is_identity = CustomGateAnalyzer._is_identity(checks, tol)
         is_rotation = CustomGateAnalyzer._is_rotation_gate(matrix, qubit_count)
         determinant = np.linalg.det(matrix)
         is_special = np.isclose(abs(determinant), 1.0)
@@ -3,8 +3,54 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QComboBox, QGroupBox, QScrollArea, QWidget, QApplication)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QCursor
+from functools import lru_cache
 import numpy as np
 
+# Users may type 'i' for the imaginary unit
+_IMAG_UNIT = str.maketrans('i', 'j')
+
+# U†U must match I to np.allclose's default tolerances (absolute, plus relative on the diagonal)
+_UNITARY_ATOL = 1e-8
+_UNITARY_RTOL = 1e-5
+
+# Single-qubit preset matrices, keyed by the preset combobox item data
+_PRESETS_1Q = {
+    "identity": np.eye(2),
+    "pauli_x": np.array([[0, 1], [1, 0]]),
+    "pauli_y": np.array([[0, -1j], [1j, 0]]),
+    "pauli_z": np.array([[1, 0], [0, -1]]),
+    "hadamard": np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+    "phase": np.array([[1, 0], [0, 1j]]),
+    "t_gate": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]]),
+    "rx_90": np.array([[1, -1j], [-1j, 1]]) / np.sqrt(2),
+    "ry_90": np.array([[1, -1], [1, 1]]) / np.sqrt(2),
+    "rz_90": np.array([[np.exp(-1j * np.pi / 4), 0], 
+                       [0, np.exp(1j * np.pi / 4)]]),
+}
+for _preset in _PRESETS_1Q.values():
+    _preset.setflags(write=False)  # Shared across dialogs, so keep them read-only
+
+
+def _fmt(val):
+    """Format a matrix entry the way users type it: '0.707107', '-1j', '0.5+0.5j'."""
+    real, imag = val.real, val.imag
+    if imag == 0:
+        return f"{real:.6g}"
+    if real == 0:  # Pure imaginary
+        return f"{imag:.6g}j"
+    return f"{real:.6g}{imag:+.6g}j"
+
+
+# Presets as entry texts (row by row), formatted once so applying one is just setText calls
+_PRESET_STRINGS_1Q = {name: tuple(_fmt(val) for val in matrix.ravel())
+                      for name, matrix in _PRESETS_1Q.items()}
+
+
+@lru_cache(maxsize=8)
+def _basis_labels(num_qubits):
+    """Computational basis states as bit strings, e.g. ('00', '01', '10', '11')."""
+    return tuple(format(i, f'0{num_qubits}b') for i in range(1 << num_qubits))
+
 
 class CustomGateDialog(QDialog):
     """Dialog for entering custom unitary gate matrices."""
@@ -14,6 +60,12 @@ class CustomGateDialog(QDialog):
         self.num_qubits = num_qubits
         self.matrix = None
         self.gate_name = None
+        self._last_validation = None  # (cell texts, matrix, max deviation, is unitary) of the last check
+        # Matrix input widgets, created on first use and recycled across qubit counts
+        self._matrix_grid = None
+        self._col_headers = []
+        self._row_headers = []
+        self._entry_pool = []  # _entry_pool[i][j] -> QLineEdit, sized to the largest matrix shown
         self.setup_ui()
     
     def showEvent(self, event):
@@ -121,67 +173,83 @@ class CustomGateDialog(QDialog):
         self.create_matrix_inputs()
     
     def create_matrix_inputs(self):
-        """Create input fields for matrix entries."""
-        # Clear existing inputs
-        while self.matrix_layout.count():
-            item = self.matrix_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
+        """Show input fields for the current matrix size, reusing existing widgets."""
         dim = 2 ** self.num_qubits
-        self.matrix_inputs = []
+        labels = _basis_labels(self.num_qubits)
+        
+        if self._matrix_grid is None:
+            # Title, basis order and the matrix grid are built once and relabelled after
+            self._matrix_title = QLabel()
+            self._matrix_title.setStyleSheet("font-weight: bold; font-size: 14px;")
+            self.matrix_layout.addWidget(self._matrix_title)
+            
+            self._basis_label = QLabel()
+            self._basis_label.setStyleSheet("color: gray; font-size: 11px;")
+            self.matrix_layout.addWidget(self._basis_label)
+            
+            self._matrix_grid = QGridLayout()
+            self._matrix_grid.setSpacing(5)
+            self.matrix_layout.addLayout(self._matrix_grid)
+            self.matrix_layout.addStretch()
         
         # Title
-        title = QLabel(f"Unitary Matrix ({dim}×{dim})")
-        title.setStyleSheet("font-weight: bold; font-size: 14px;")
-        self.matrix_layout.addWidget(title)
+        self._matrix_title.setText(f"Unitary Matrix ({dim}×{dim})")
         
         # Computational basis label
-        basis_label = QLabel("Computational basis order: " + 
-                            " → ".join([format(i, f'0{self.num_qubits}b') 
-                                      for i in range(dim)]))
-        basis_label.setStyleSheet("color: gray; font-size: 11px;")
-        self.matrix_layout.addWidget(basis_label)
-        
-        # Matrix grid
-        grid = QGridLayout()
-        grid.setSpacing(5)
-        
-        # Column headers (output states)
-        for j in range(dim):
-            header = QLabel(format(j, f'0{self.num_qubits}b'))
+        self._basis_label.setText("Computational basis order: " + " → ".join(labels))
+        
+        # Grow the widget pool up to dim; widgets past dim are hidden, not destroyed.
+        # Repaints are held until the whole grid is rearranged
+        self.matrix_widget.setUpdatesEnabled(False)
+        grid = self._matrix_grid
+        while len(self._col_headers) < dim:
+            # Column headers (output states)
+            header = QLabel()
             header.setStyleSheet("font-weight: bold; color: blue;")
             header.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            grid.addWidget(header, 0, j + 1)
-        
-        # Row headers (input states) and inputs
-        for i in range(dim):
-            # Row header
-            header = QLabel(format(i, f'0{self.num_qubits}b'))
+            grid.addWidget(header, 0, len(self._col_headers) + 1)
+            self._col_headers.append(header)
+        while len(self._row_headers) < dim:
+            # Row headers (input states)
+            header = QLabel()
             header.setStyleSheet("font-weight: bold; color: blue;")
             header.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            grid.addWidget(header, i + 1, 0)
-            
-            row_inputs = []
-            for j in range(dim):
+            grid.addWidget(header, len(self._row_headers) + 1, 0)
+            self._row_headers.append(header)
+            self._entry_pool.append([])
+        for i, row in enumerate(self._entry_pool):
+            while len(row) < len(self._col_headers):
                 entry = QLineEdit()
-                entry.setPlaceholderText("0")
                 entry.setFixedWidth(100)
                 entry.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                
-                # Set default values for identity
-                if i == j:
-                    entry.setText("1")
-                else:
-                    entry.setText("0")
-                
-                grid.addWidget(entry, i + 1, j + 1)
-                row_inputs.append(entry)
-            
-            self.matrix_inputs.append(row_inputs)
-        
-        self.matrix_layout.addLayout(grid)
-        self.matrix_layout.addStretch()
+                grid.addWidget(entry, i + 1, len(row) + 1)
+                row.append(entry)
+        
+        for k, (col_header, row_header) in enumerate(zip(self._col_headers, self._row_headers)):
+            if k < dim:
+                col_header.setText(labels[k])
+                row_header.setText(labels[k])
+            col_header.setVisible(k < dim)
+            row_header.setVisible(k < dim)
+        for i, row in enumerate(self._entry_pool):
+            for j, entry in enumerate(row):
+                entry.setVisible(i < dim and j < dim)
+        
+        self.matrix_inputs = [row[:dim] for row in self._entry_pool[:dim]]
+        
+        # Set default values for identity
+        self._set_entry_texts("1" if i == j else "0" for i in range(dim) for j in range(dim))
+        self.matrix_widget.setUpdatesEnabled(True)
+        self.matrix_widget.updateGeometry()
+    
+    def _set_entry_texts(self, texts):
+        """Assign `texts` to the matrix entries row by row; callers hold repaints around it."""
+        entries = (entry for row in self.matrix_inputs for entry in row)
+        for entry, text in zip(entries, texts):
+            # No textChanged per cell while the matrix is being filled
+            entry.blockSignals(True)
+            entry.setText(text)
+            entry.blockSignals(False)
     
     def apply_preset(self, index):
         """Apply a preset gate matrix."""
@@ -190,93 +258,75 @@ class CustomGateDialog(QDialog):
         
         preset_id = self.preset_1qubit.itemData(index)
         
-        presets = {
-            "identity": np.eye(2),
-            "pauli_x": np.array([[0, 1], [1, 0]]),
-            "pauli_y": np.array([[0, -1j], [1j, 0]]),
-            "pauli_z": np.array([[1, 0], [0, -1]]),
-            "hadamard": np.array([[1, 1], [1, -1]]) / np.sqrt(2),
-            "phase": np.array([[1, 0], [0, 1j]]),
-            "t_gate": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]]),
-            "rx_90": np.array([[1, -1j], [-1j, 1]]) / np.sqrt(2),
-            "ry_90": np.array([[1, -1], [1, 1]]) / np.sqrt(2),
-            "rz_90": np.array([[np.exp(-1j * np.pi / 4), 0], 
-                               [0, np.exp(1j * np.pi / 4)]]),
-        }
-        
-        if preset_id in presets:
-            matrix = presets[preset_id]
-            self.fill_matrix(matrix)
+        if preset_id in _PRESET_STRINGS_1Q:
+            self._apply_strings(_PRESET_STRINGS_1Q[preset_id], 1)
             # Reset preset selector
             self.preset_1qubit.setCurrentIndex(0)
     
     def fill_matrix(self, matrix):
         """Fill matrix input fields with values."""
-        dim = matrix.shape[0]
-        required_qubits = int(np.log2(dim))
-        
-        if required_qubits != self.num_qubits:
-            # Switch to correct qubit count
-            self.qubit_selector.setCurrentIndex(required_qubits - 1)
-            self.num_qubits = required_qubits
-            self.create_matrix_inputs()
-        
-        for i in range(dim):
-            for j in range(dim):
-                val = matrix[i, j]
-                # Format complex number nicely
-                if np.isreal(val):
-                    text = f"{val.real:.6g}"
-                elif np.isreal(val * 1j):  # Pure imaginary
-                    text = f"{val.imag:.6g}j"
-                else:
-                    real_part = f"{val.real:.6g}" if val.real != 0 else ""
-                    imag_part = f"{val.imag:+.6g}j" if val.imag != 0 else ""
-                    text = real_part + imag_part
-                
-                self.matrix_inputs[i][j].setText(text)
+        required_qubits = matrix.shape[0].bit_length() - 1
+        self._apply_strings((_fmt(val) for val in matrix.ravel()), required_qubits)
+    
+    def _apply_strings(self, texts, num_qubits):
+        """Fill the entries with preformatted `texts`, switching to `num_qubits` first if needed."""
+        if num_qubits != self.num_qubits:
+            # Switch to correct qubit count; on_qubit_count_changed rebuilds the inputs
+            self.qubit_selector.setCurrentIndex(num_qubits - 1)
+        
+        # One repaint for the whole matrix instead of one per entry
+        self.matrix_widget.setUpdatesEnabled(False)
+        self._set_entry_texts(texts)
+        self.matrix_widget.setUpdatesEnabled(True)
+    
+    def _input_texts(self):
+        """Normalized text of every matrix cell, row by row."""
+        # Allow 'i' for imaginary; empty cells count as 0
+        return tuple(entry.text().strip().translate(_IMAG_UNIT) or '0'
+                     for row in self.matrix_inputs for entry in row)
     
-    def get_matrix_from_inputs(self):
-        """Parse matrix from input fields."""
+    def get_matrix_from_inputs(self, texts=None):
+        """Parse matrix from input fields (or from already collected `texts`)."""
         dim = 2 ** self.num_qubits
-        matrix = np.zeros((dim, dim), dtype=complex)
-        
-        for i in range(dim):
-            for j in range(dim):
-                text = self.matrix_inputs[i][j].text().strip()
+        if texts is None:
+            texts = self._input_texts()
+        try:
+            values = [complex(text) for text in texts]
+        except ValueError:
+            # Only walk the cells one by one to report which one is invalid
+            for idx, text in enumerate(texts):
                 try:
-                    # Handle various complex number formats
-                    text = text.replace('i', 'j')  # Allow 'i' for imaginary
-                    if text == '':
-                        matrix[i, j] = 0
-                    elif 'j' in text or '+' in text or '-' in text[1:]:
-                        matrix[i, j] = complex(text)
-                    else:
-                        matrix[i, j] = complex(float(text), 0)
-                except ValueError as e:
+                    complex(text)
+                except ValueError:
+                    i, j = divmod(idx, dim)
                     QMessageBox.warning(self, "Invalid Input", 
                                        f"Invalid value at [{i},{j}]: {text}\n"
                                        f"Use format: a+bj or a-bj")
                     return None
         
-        return matrix
+        return np.array(values, dtype=complex).reshape(dim, dim)
     
     def validate_matrix(self):
-        """Check if matrix is unitary."""
-        matrix = self.get_matrix_from_inputs()
-        if matrix is None:
-            return False
+        """Check if matrix is unitary; returns the parsed matrix, or None if it is invalid."""
+        texts = self._input_texts()
+        if self._last_validation is not None and self._last_validation[0] == texts:
+            # Same entries as the last check (e.g. Validate, then Create Gate)
+            _, matrix, deviation, is_unitary = self._last_validation
+        else:
+            matrix = self.get_matrix_from_inputs(texts)
+            if matrix is None:
+                return None
+            
+            # Check if unitary: U†U = I, i.e. the columns are orthonormal
+            identity = np.eye(matrix.shape[0])
+            err = np.abs(matrix.conj().T @ matrix - identity)
+            is_unitary = (err <= _UNITARY_ATOL + _UNITARY_RTOL * identity).all()
+            deviation = err.max()
+            matrix.flags.writeable = False
+            self._last_validation = (texts, matrix, deviation, is_unitary)
         
         dim = matrix.shape[0]
         
-        # Check if unitary: U†U = I
-        dagger_u = matrix.conj().T
-        product = dagger_u @ matrix
-        identity = np.eye(dim)
-        
-        # Check if product is close to identity
-        is_unitary = np.allclose(product, identity)
-        
         if is_unitary:
             # Show matrix properties
             det = np.linalg.det(matrix)
@@ -289,17 +339,16 @@ class CustomGateDialog(QDialog):
                 msg += f"|{row_str}|\n"
             
             QMessageBox.information(self, "Matrix Validation", msg)
-            return True
+            return matrix
         else:
             # Show error details
-            deviation = np.max(np.abs(product - identity))
             msg = f"✗ Matrix is NOT unitary!\n\n"
             msg += f"Max deviation from identity: {deviation:.6f}\n"
             msg += f"U†U should equal I, but it doesn't.\n"
             msg += f"\nMake sure columns are orthonormal."
             
             QMessageBox.warning(self, "Matrix Validation", msg)
-            return False
+            return None
     
     def create_gate(self):
         """Create the custom gate."""
@@ -309,12 +358,13 @@ class CustomGateDialog(QDialog):
             QMessageBox.warning(self, "Missing Name", "Please enter a gate name.")
             return
         
-        # Validate matrix
-        if not self.validate_matrix():
+        # Validate matrix (parsed once; reused as the result)
+        matrix = self.validate_matrix()
+        if matrix is None:
             return
         
         self.gate_name = name
-        self.matrix = self.get_matrix_from_inputs()
+        self.matrix = matrix
         self.accept()
     
     def get_result(self):
@@ -0,0 +1,33 @@
+import numpy as np
+
+from PyQt6.QtCore import QMimeData
+
+
+class GateMimeData(QMimeData):
+    """Drag payload that carries the gate fields as Python attributes.
+
+    In-process drops read ``gate``/``q``/``t`` directly instead of splitting
+    and int-parsing the text form. The text ("GATE" for palette drags,
+    "MOVE:GATE:q:t" for moves) is still set for anything that only reads text.
+    """
+
+    def __init__(self, gate: str, q: int | None = None, t: int | None = None,
+                 matrix: np.ndarray | None = None):
+        super().__init__()
+        self.gate = gate
+        self.q = q  # Source position; None for drags coming from the palette
+        self.t = t
+        self.matrix = matrix
+        self.setText(gate if q is None else f"MOVE:{gate}:{q}:{t}")
+
+
+def parse_gate_mime(mime: QMimeData) -> tuple[str, int | None, int | None]:
+    """Return (gate_name, old_q, old_t) for a drag payload; old_q/old_t are None for new gates."""
+    if isinstance(mime, GateMimeData):
+        return mime.gate, mime.q, mime.t
+    text = mime.text()
+    # Parse MOVE payloads: "MOVE:NAME:old_q:old_t"
+    if text.startswith("MOVE:"):
+        _, gate_name, old_q, old_t = text.split(":")
+        return gate_name, int(old_q), int(old_t)
+    return text, None, None
@@ -1,41 +1,51 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea, QApplication
-from PyQt6.QtCore import Qt, QMimeData
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea, QApplication, QFrame
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QDrag, QPainter, QColor, QPixmap, QFont, QFontMetrics
+from .gate_mime_data import GateMimeData
 
 class DraggableButton(QPushButton):
+    _DRAG_FONT = QFont("Sans", 10, QFont.Weight.Bold)
+    _DRAG_BG = QColor(20, 40, 120, 160)
+    _DRAG_FG = QColor(255, 255, 255, 220)
+
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
         self.setObjectName("GateButton")
         self.gate_type = text
+        self._drag_pixmap = None  # Built on first drag, see _build_drag_pixmap
+        self._drag_hotspot = None
+
+    def _build_drag_pixmap(self):
+        """Create a semi-transparent rounded pixmap for the drag (IBM-like shadow)."""
+        w, h = 50, 50
+        pixmap = QPixmap(w, h)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = pixmap.rect().adjusted(4, 4, -4, -4)
+        painter.setBrush(self._DRAG_BG)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(rect, 8, 8)
+        painter.setFont(self._DRAG_FONT)
+        painter.setPen(self._DRAG_FG)
+        fm = QFontMetrics(self._DRAG_FONT)
+        tx = (w - fm.horizontalAdvance(self.gate_type)) // 2
+        ty = (h + fm.ascent() - fm.descent()) // 2
+        painter.drawText(tx, ty, self.gate_type)
+        painter.end()
+        return pixmap
 
     def mouseMoveEvent(self, e):
         if e.buttons() == Qt.MouseButton.LeftButton:
             drag = QDrag(self)
-            mime = QMimeData()
-            mime.setText(self.gate_type)
-            drag.setMimeData(mime)
-
-            # Create a semi-transparent rounded pixmap for the drag (IBM-like shadow)
-            w, h = 50, 50
-            pixmap = QPixmap(w, h)
-            pixmap.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            rect = pixmap.rect().adjusted(4, 4, -4, -4)
-            painter.setBrush(QColor(20, 40, 120, 160))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, 8, 8)
-            font = QFont("Sans", 10, QFont.Weight.Bold)
-            painter.setFont(font)
-            painter.setPen(QColor(255, 255, 255, 220))
-            fm = QFontMetrics(font)
-            tx = (w - fm.horizontalAdvance(self.gate_type)) // 2
-            ty = (h + fm.ascent() - fm.descent()) // 2
-            painter.drawText(tx, ty, self.gate_type)
-            painter.end()
+            drag.setMimeData(GateMimeData(self.gate_type))
 
-            drag.setPixmap(pixmap)
-            drag.setHotSpot(pixmap.rect().center())
+            # The badge only depends on gate_type, so it is drawn once and reused
+            if self._drag_pixmap is None:
+                self._drag_pixmap = self._build_drag_pixmap()
+                self._drag_hotspot = self._drag_pixmap.rect().center()
+            drag.setPixmap(self._drag_pixmap)
+            drag.setHotSpot(self._drag_hotspot)
 
             # Cursor: show copy cursor while dragging from palette
             QApplication.setOverrideCursor(Qt.CursorShape.DragCopyCursor)
@@ -76,10 +86,14 @@ class PaletteView(QWidget):
             layout.addWidget(btn)
         
         # Add separator and custom gate button
-        separator = QLabel("—" * 10)
-        separator.setStyleSheet("color: #ccc; margin: 10px 0;")
-        separator.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        separator = QFrame()
+        separator.setFrameShape(QFrame.Shape.HLine)
+        separator.setFrameShadow(QFrame.Shadow.Plain)
+        # The scroll area's "border: none" cascades here, so draw the line as a top border
+        separator.setStyleSheet("border: none; border-top: 1px solid #ccc;")
+        layout.addSpacing(10)
         layout.addWidget(separator)
+        layout.addSpacing(10)
         
         custom_btn = DraggableButton("CUSTOM")
         custom_btn.setStyleSheet("""
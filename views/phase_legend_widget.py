@@ -1,16 +1,43 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QLinearGradient, QPixmap
-import numpy as np
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QImage, QPainterPath, QFontMetrics
+import math
 
 
 class PhaseLegendWidget(QWidget):
     """Fixed legend showing phase angle color scheme."""
     
+    _TITLE_FONT = QFont("Sans", 8, QFont.Weight.Bold)
+    _TICK_FONT = QFont("Sans", 7)
+    _TEXT_PEN = QPen(QColor(200, 200, 200))
+    _BORDER_PEN = QPen(QColor(150, 150, 150), 1)
+    _BG_COLOR = QColor(30, 30, 30)
+    _EMPTY_BRUSH = QBrush()
+    # (fraction of the bar, label) for each tick
+    _TICKS = ((0, "0"), (0.25, "π/2"), (0.5, "π"), (0.75, "3π/2"), (1, "2π"))
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(300, 80)
         self.setToolTip("Phase angle color scheme: hue represents phase from 0 to 2π")
+        self._gradient_img = None  # One-pixel-high hue strip, rebuilt when the bar width changes
+        metrics = QFontMetrics(self._TICK_FONT)
+        self._label_widths = {label: metrics.horizontalAdvance(label) for _, label in self._TICKS}
+    
+    def resizeEvent(self, event):
+        self._gradient_img = None
+        super().resizeEvent(event)
+    
+    def _build_gradient(self, bar_width):
+        """Phase-to-hue strip, one pixel per column of the bar."""
+        img = QImage(bar_width, 1, QImage.Format.Format_RGB32)
+        for i in range(bar_width):
+            # Map position to phase angle 0 to 2π
+            phase = (i / bar_width) * 2 * math.pi
+            # Convert phase to hue (0 to 360 degrees)
+            hue = int((phase / (2 * math.pi)) * 360)
+            img.setPixelColor(i, 0, QColor.fromHsv(hue, 255, 255))
+        return img
     
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -19,12 +46,11 @@ class PhaseLegendWidget(QWidget):
         w, h = self.width(), self.height()
         
         # Background
-        painter.fillRect(0, 0, w, h, QColor(30, 30, 30))
+        painter.fillRect(0, 0, w, h, self._BG_COLOR)
         
         # Title
-        painter.setPen(QPen(QColor(200, 200, 200)))
-        font = QFont("Sans", 8, QFont.Weight.Bold)
-        painter.setFont(font)
+        painter.setPen(self._TEXT_PEN)
+        painter.setFont(self._TITLE_FONT)
         painter.drawText(10, 15, "Phase Angle (radians)")
         
         # Draw color gradient bar
@@ -33,40 +59,27 @@ class PhaseLegendWidget(QWidget):
         bar_width = w - 20
         bar_height = 25
         
-        # Create gradient with HSV colors (phase coloring)
-        for i in range(bar_width):
-            # Map position to phase angle 0 to 2π
-            phase = (i / bar_width) * 2 * np.pi
-            # Convert phase to hue (0 to 360 degrees)
-            hue = int((phase / (2 * np.pi)) * 360)
-            color = QColor.fromHsv(hue, 255, 255)
-            painter.setPen(QPen(color, 1))
-            painter.drawLine(bar_x + i, bar_y, bar_x + i, bar_y + bar_height)
+        # HSV gradient (phase coloring), stretched from the cached strip in one blit
+        if self._gradient_img is None:
+            self._gradient_img = self._build_gradient(bar_width)
+        painter.drawImage(QRect(bar_x, bar_y, bar_width, bar_height), self._gradient_img)
         
         # Draw border around bar
-        painter.setPen(QPen(QColor(150, 150, 150), 1))
-        painter.setBrush(QBrush())  # No fill
+        painter.setPen(self._BORDER_PEN)
+        painter.setBrush(self._EMPTY_BRUSH)  # No fill
         painter.drawRect(bar_x, bar_y, bar_width, bar_height)
         
         # Draw tick marks and labels
-        painter.setPen(QPen(QColor(200, 200, 200)))
-        font = QFont("Sans", 7)
-        painter.setFont(font)
-        
-        tick_positions = [
-            (0, "0"),
-            (bar_width * 0.25, "π/2"),
-            (bar_width * 0.5, "π"),
-            (bar_width * 0.75, "3π/2"),
-            (bar_width, "2π")
-        ]
+        painter.setPen(self._TEXT_PEN)
+        painter.setFont(self._TICK_FONT)
         
-        for pos, label in tick_positions:
-            x = bar_x + int(pos)
-            # Tick mark
-            painter.drawLine(x, bar_y + bar_height, x, bar_y + bar_height + 5)
-            # Label
-            text_width = painter.fontMetrics().horizontalAdvance(label)
-            painter.drawText(x - text_width // 2, bar_y + bar_height + 18, label)
+        # All tick marks go out in one path; labels use the widths measured in __init__
+        ticks = QPainterPath()
+        for fraction, label in self._TICKS:
+            x = bar_x + int(bar_width * fraction)
+            ticks.moveTo(x, bar_y + bar_height)
+            ticks.lineTo(x, bar_y + bar_height + 5)
+            painter.drawText(x - self._label_widths[label] // 2, bar_y + bar_height + 18, label)
+        painter.drawPath(ticks)
         
         painter.end()
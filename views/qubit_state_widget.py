@@ -1,18 +1,30 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont
-import numpy as np
+from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QPixmap
+import math
+
+# Fully saturated marker color for each integer hue, indexed by hue in degrees
+_HUE_COLORS = tuple(QColor.fromHsv(h, 255, 255) for h in range(360))
 
 
 class QubitStateWidget(QWidget):
     """Inline visualization of a single qubit's state as a simplified Bloch sphere."""
     
+    _LABEL_FONT = QFont("Sans", 7)
+    _PHASE_FONT = QFont("Sans", 6)
+    _SPHERE_PEN = QPen(QColor(150, 150, 150), 1)
+    _SPHERE_BRUSH = QBrush(QColor(40, 40, 40))
+    _AXIS_PEN = QPen(QColor(80, 80, 80), 1, Qt.PenStyle.DashLine)
+    _PHASE_PEN = QPen(QColor(150, 150, 150))
+    _LABEL_PEN = QPen(QColor(200, 200, 200))
+    
     def __init__(self, qubit_idx, parent=None):
         super().__init__(parent)
         self.qubit_idx = qubit_idx
         self.bloch_x = 0.0
         self.bloch_y = 0.0
         self.bloch_z = 1.0
+        self._bg_cache = None  # Sphere, axes and label; rebuilt only when the size changes
         self.setFixedSize(80, 80)
         self.setToolTip(f"Qubit {qubit_idx} state visualization - color shows phase, position shows state")
     
@@ -22,30 +34,63 @@ class QubitStateWidget(QWidget):
         Args:
             bloch_vector: Tuple (x, y, z) representing the Bloch vector
         """
-        self.bloch_x, self.bloch_y, self.bloch_z = bloch_vector
+        x, y, z = bloch_vector
+        if (abs(x - self.bloch_x) < 1e-9 and abs(y - self.bloch_y) < 1e-9
+                and abs(z - self.bloch_z) < 1e-9):
+            return  # Unchanged; skip the repaint
+        self.bloch_x, self.bloch_y, self.bloch_z = x, y, z
         self.update()
     
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def resizeEvent(self, event):
+        self._bg_cache = None
+        super().resizeEvent(event)
+    
+    def _build_background(self):
+        """Render the state-independent part of the widget: sphere, axes and qubit label."""
+        w, h = self.width(), self.height()
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(w * ratio), round(h * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Widget dimensions
-        w, h = self.width(), self.height()
         center_x, center_y = w // 2, h // 2
         radius = min(w, h) // 2 - 8
         
         # Draw sphere outline (circle) - don't fill since stylesheet handles background
-        painter.setPen(QPen(QColor(150, 150, 150), 1))
-        painter.setBrush(QBrush(QColor(40, 40, 40)))
+        painter.setPen(self._SPHERE_PEN)
+        painter.setBrush(self._SPHERE_BRUSH)
         painter.drawEllipse(center_x - radius, center_y - radius, radius * 2, radius * 2)
         
         # Draw axes
-        painter.setPen(QPen(QColor(80, 80, 80), 1, Qt.PenStyle.DashLine))
+        painter.setPen(self._AXIS_PEN)
         # Z-axis (vertical)
         painter.drawLine(center_x, center_y - radius, center_x, center_y + radius)
         # X-axis (horizontal)
         painter.drawLine(center_x - radius, center_y, center_x + radius, center_y)
         
+        # Draw label
+        painter.setPen(self._LABEL_PEN)
+        painter.setFont(self._LABEL_FONT)
+        painter.drawText(2, 12, f"q[{self.qubit_idx}]")
+        
+        painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        if self._bg_cache is None:
+            self._bg_cache = self._build_background()
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._bg_cache)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Widget dimensions
+        w, h = self.width(), self.height()
+        center_x, center_y = w // 2, h // 2
+        radius = min(w, h) // 2 - 8
+        
         # Calculate projection of Bloch vector
         # Map 3D Bloch vector to 2D circle with perspective
         # x maps to horizontal, z affects vertical with perspective
@@ -58,20 +103,21 @@ class QubitStateWidget(QWidget):
         
         # Draw the state vector as a point
         # Calculate phase from x and y components
-        phase = np.arctan2(self.bloch_y, self.bloch_x)  # Range: -π to π
-        if phase < 0:
-            phase += 2 * np.pi  # Convert to 0 to 2π range
+        phase = math.atan2(self.bloch_y, self.bloch_x) % (2 * math.pi)  # Range: 0 to 2π
         
         # Map phase to hue (0 to 360 degrees)
         # 0 = red, π/2 = yellow/green, π = cyan, 3π/2 = blue, 2π = red
-        hue = int((phase / (2 * np.pi)) * 360)
+        hue = int((phase / (2 * math.pi)) * 360) % 360
         
         # Saturation based on how far from the poles (|Z| close to 1 means low saturation)
         # Maximum saturation at equator (Z=0), minimum at poles
-        xy_magnitude = np.sqrt(self.bloch_x**2 + self.bloch_y**2)
+        xy_magnitude = math.hypot(self.bloch_x, self.bloch_y)
         saturation = int(155 + 100 * xy_magnitude)  # 155-255 range
         
-        color = QColor.fromHsv(hue % 360, saturation, 255)
+        if saturation >= 255:
+            color = _HUE_COLORS[hue]
+        else:
+            color = QColor.fromHsv(hue, saturation, 255)
         
         painter.setPen(QPen(color, 2))
         painter.setBrush(QBrush(color))
@@ -79,16 +125,9 @@ class QubitStateWidget(QWidget):
                           marker_size, marker_size)
         
         # Draw a small indicator of the phase angle value
-        phase_deg = int(np.degrees(phase))
-        painter.setPen(QPen(QColor(150, 150, 150)))
-        font_small = QFont("Sans", 6)
-        painter.setFont(font_small)
+        phase_deg = int(math.degrees(phase))
+        painter.setPen(self._PHASE_PEN)
+        painter.setFont(self._PHASE_FONT)
         painter.drawText(2, h - 4, f"{phase_deg}°")
         
-        # Draw label
-        painter.setPen(QPen(QColor(200, 200, 200)))
-        font = QFont("Sans", 7)
-        painter.setFont(font)
-        painter.drawText(2, 12, f"q[{self.qubit_idx}]")
-        
         painter.end()
@@ -44,15 +44,6 @@ QFrame#CircuitLine {{
     min-height: 2px;
     max-height: 2px;
 }}
-/* Drop Zones */
-QLabel#DropZone {{
-    background-color: transparent;
-    border: none;
-}}
-QLabel#DropZone:hover {{
-    background-color: {COLOR_HOVER};
-    border-radius: 4px;
-}}
 /* Menus */
 QMenu {{
     background-color: #FFFFFF;
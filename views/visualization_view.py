@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib.style
+import numpy as np
 
 class VisualizationView(QWidget):
     def __init__(self):
@@ -10,7 +11,7 @@ class VisualizationView(QWidget):
         self.setLayout(layout)
 
         # Dark Theme Matplotlib
-        plt.style.use('dark_background') # Built-in dark style
+        matplotlib.style.use('dark_background') # Built-in dark style
         self.figure = Figure(figsize=(5, 4), dpi=100)
         
         # Match Window BG
@@ -19,13 +20,34 @@ class VisualizationView(QWidget):
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
 
+        # Histogram axes and bars, reused while the measured states stay the same
+        self._hist_ax = None
+        self._hist_bars = None
+        self._hist_states = None  # Sorted basis states labelling the bars
+        self._hist_state_set = None
+        self._hist_values = None  # Bar heights, indexed like _hist_states
+
     def plot_histogram(self, counts):
+        if self._hist_ax is not None and counts.keys() == self._hist_state_set:
+            # Same categories: only the bar heights change
+            values = self._hist_values
+            for i, state in enumerate(self._hist_states):
+                values[i] = counts[state]
+            for bar, value in zip(self._hist_bars, values):
+                bar.set_height(value)
+            ax = self._hist_ax
+            ax.set_ylim(0, values.max() * (1 + ax.margins()[1]))
+            self.canvas.draw_idle()
+            return
+        
+        # Bars in basis-state order, independent of the order results come back in
+        items = sorted(counts.items())
+        states = [state for state, _ in items]
+        values = np.fromiter((count for _, count in items), dtype=float, count=len(items))
+        
         self.figure.clear()
         ax = self.figure.add_subplot(111)
         
-        states = list(counts.keys())
-        values = list(counts.values())
-        
         # White Bars for high contrast
         bars = ax.bar(states, values, color='#FFFFFF')
         
@@ -42,4 +64,10 @@ class VisualizationView(QWidget):
         
         ax.set_facecolor('#121212')
 
-        self.canvas.draw()
+        self._hist_ax = ax
+        self._hist_bars = bars
+        self._hist_states = states
+        self._hist_state_set = frozenset(states)
+        self._hist_values = values
+
+        self.canvas.draw_idle()